@@ -1,87 +1,301 @@
 import sys
 import subprocess
 import os
+import io # In-memory buffers for command output
+import json # On-disk bundle list cache
 import time # For measuring connection time
 import re # Import regex module
+import shlex # Quote argv lists for display
+import shutil # Look up sshpass/rsync on PATH
+import selectors # Wait on stdout and stderr pipes together
+from dataclasses import dataclass # Credentials snapshot of the input fields
+from enum import IntEnum # UI modes for the action buttons
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLineEdit, QLabel, QTextEdit,
+    QPushButton, QLineEdit, QLabel, QPlainTextEdit,
     QFileDialog, QMessageBox, QGridLayout, QComboBox,
     QSpacerItem, QSizePolicy, QProgressBar, QCheckBox
 )
 from PyQt6.QtGui import QFont, QColor, QTextCharFormat, QTextCursor, QPainter, QBrush, QPen
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QSize
-
-# QThread class to run SSH commands in the background
-# This prevents the GUI from freezing while commands are executed
-class WorkerThread(QThread):
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal, QTimer, QSize, QStringListModel
+
+# rsync --info=progress2 will output like '25% 1.23MB/s'
+_PROGRESS_RE = re.compile(rb'(\d+)%')
+# The extract script reports the generated file like 'IPA: YourApp.ipa'
+_IPA_RE = re.compile(rb"IPA: (.+\.ipa)")
+# External programs looked up once at startup by ToolCheckRunnable
+_TOOLS = ("ssh", "scp", "rsync", "sshpass", "ssh-keygen")
+# Control sockets of the shared SSH connections, in a private (0700) per-user directory so no other
+# local user can create or connect to them
+_CTL_DIR = os.path.expanduser("~/.cache/extractipa/ssh")
+# Key created by "Install SSH Key", offered to ssh on every connection when it exists
+_KEY_FILE = os.path.expanduser("~/.config/extractipa/id_ed25519")
+
+# Log text formats keyed by color string, so each color is parsed only once
+_LOG_FORMATS = {}
+
+def _log_format(color):
+    fmt = _LOG_FORMATS.get(color)
+    if fmt is None:
+        fmt = QTextCharFormat()
+        fmt.setForeground(QColor(color))
+        _LOG_FORMATS[color] = fmt
+    return fmt
+
+# Current values of the connection and script inputs, kept up to date by IPAExtractorApp._refresh_creds
+@dataclass
+class Credentials:
+    ip: str = ""
+    username: str = ""
+    password: str = ""
+    remote_script: str = ""
+    local_script: str = ""
+
+# What the action buttons allow, one mode at a time (see IPAExtractorApp._apply_mode)
+class UiMode(IntEnum):
+    IDLE = 0 # Not connected
+    CONNECTED = 1 # Connected, no IPA ready
+    IPA_READY = 2 # Connected and the last script run produced an IPA
+    BUSY = 3 # A command is running
+    FETCHING = 4 # Bundle list is loading, disconnect stays available
+
+# One bit per action button. The script bit goes to Transfer & Run or Run, whichever the mechanism shows
+_BTN_CONNECT = 1 << 0
+_BTN_DISCONNECT = 1 << 1
+_BTN_REFRESH = 1 << 2
+_BTN_SCRIPT = 1 << 3
+_BTN_DOWNLOAD = 1 << 4
+_BTN_KEY = 1 << 5
+
+# Enabled buttons for each mode
+_MODE_ENABLED = {
+    UiMode.IDLE: _BTN_CONNECT,
+    UiMode.CONNECTED: _BTN_DISCONNECT | _BTN_REFRESH | _BTN_SCRIPT | _BTN_KEY,
+    UiMode.IPA_READY: _BTN_DISCONNECT | _BTN_REFRESH | _BTN_SCRIPT | _BTN_DOWNLOAD | _BTN_KEY,
+    UiMode.BUSY: 0,
+    UiMode.FETCHING: _BTN_DISCONNECT,
+}
+
+# Signals for SshRunnable (QRunnable is not a QObject and cannot have signals itself)
+class WorkerSignals(QObject):
     finished = pyqtSignal(str, str, int, float)  # stdout, stderr, returncode, time_taken
-    error = pyqtSignal(str) # For general errors (e.g., command not found)
-    progress_update = pyqtSignal(int) # New signal for progress updates
-    log_message = pyqtSignal(str, str) # New signal to send logs to the main thread
-
-    def __init__(self, command, measure_time=False, is_download=False):
+    error = pyqtSignal(str)
+    progress_update = pyqtSignal(int)
+    log_message = pyqtSignal(str, str)
+    ipa_detected = pyqtSignal(str)
+    bundle_entries = pyqtSignal(list) # Bundle paths of a listing, one batch per output chunk
+
+# Runs one command on the shared QThreadPool and reports through the finished/error/progress_update/log_message signals
+# This prevents the GUI from freezing while commands are executed, without creating a thread per command
+class SshRunnable(QRunnable):
+    def __init__(self, command, measure_time=False, is_download=False, env=None, debug=False, stdin_path=None, watch_ipa=False, reconnect=False, stream_bundles=False):
         super().__init__()
-        self.command = command
+        self.setAutoDelete(False) # The app keeps a reference, Python owns it
+        self.signals = WorkerSignals()
+        # Expose the signals on the runnable itself, so callers connect to worker.finished etc.
+        self.finished = self.signals.finished
+        self.error = self.signals.error
+        self.progress_update = self.signals.progress_update
+        self.log_message = self.signals.log_message
+        self.ipa_detected = self.signals.ipa_detected
+        self.bundle_entries = self.signals.bundle_entries
+        self.command = command # argv list, run without a shell
+        self.reconnect = reconnect # Retry once if the SSH connection dropped before the command ran
+        self.cancelled = False # Set by cancel(), e.g. on Disconnect, so a killed command is not retried
+        self.watch_ipa = watch_ipa # Look for the 'IPA: ...' line while stdout streams in
+        self._ipa_line_buffer = bytearray() # Incomplete stdout line carried between chunks for the IPA search
+        self.stream_bundles = stream_bundles # Report bundle paths of a list_bundles command while they arrive
+        self._bundle_buffer = bytearray() # Incomplete bundle path carried between chunks
+        self._bundle_mtime_seen = False # The listing starts with the mtime line, paths follow
+        self.stdin_path = stdin_path # Local file fed to the command's stdin, if any
+        self.debug = debug # Only debug mode shows the executed command, so skip the signal otherwise
+        self.env = env # Environment for the command (None inherits ours)
         self.measure_time = measure_time
         self.is_download = is_download # Flag to identify download operations
+        self._out_buf = io.BytesIO() # Raw stdout collected from the command
+        self._err_buf = io.BytesIO() # Raw stderr collected from the command
+        self._last_pct = -1 # Last progress value sent to the UI
+        self._last_emit = 0.0 # time.monotonic() of the last progress update
 
     def run(self):
         start_time = time.time()
         try:
-            # Send the command to be executed to the main UI log
-            self.log_message.emit(f"Executing command: {self.command}", "purple")
+            # Send the command to be executed to the main UI log (debug mode only)
+            if self.debug:
+                self.log_message.emit(f"Executing command: {shlex.join(self.command)}", "purple")
+
+            returncode = self._run_process()
+            # ssh exits with 255 when the connection itself failed, e.g. a shared connection that went stale
+            # during a Wi-Fi drop. Try once more over a fresh connection if nothing ran yet (downloads resume)
+            if self.reconnect and not self.cancelled and returncode == 255 and (self.is_download or not self._out_buf.getvalue()):
+                self.log_message.emit("SSH connection lost, reconnecting and retrying once...", "orange")
+                self._out_buf = io.BytesIO()
+                self._err_buf = io.BytesIO()
+                returncode = self._run_process()
+            if self.watch_ipa and self._ipa_line_buffer:
+                self._scan_ipa_name(b'\n') # The output may end without a line break, search the last line too
+            end_time = time.time()
+            time_taken = end_time - start_time
 
-            # Use Popen to process output in real-time
+            # Decode like text mode did, including the '\r' -> '\n' newline translation
+            stdout = self._out_buf.getvalue().decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+            stderr = self._err_buf.getvalue().decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+
+            self.finished.emit(stdout, stderr, returncode, time_taken)
+
+        except FileNotFoundError as e:
+            if self.stdin_path and e.filename == self.stdin_path:
+                self.error.emit(f"Error: local script {self.stdin_path} not found.") # Removed after it was checked
+            else:
+                self.error.emit("Error: SSH, SCP, or rsync command not found. Make sure it's installed and in your PATH.")
+        except Exception as e:
+            self.error.emit(f"An error occurred while running the command: {e}")
+
+    def cancel(self):
+        # Called from the UI thread, the running command is ended by closing the shared connection
+        self.cancelled = True
+
+    def _run_process(self):
+        # Run the command once, collecting output into _out_buf/_err_buf, and return its exit code
+        # Use Popen with raw binary pipes so output can be read in chunks as soon as it arrives
+        stdin_file = open(self.stdin_path, "rb") if self.stdin_path else None
+        try:
             process = subprocess.Popen(
                 self.command,
-                shell=True,
+                stdin=stdin_file,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True, # Get output as text
-                encoding='utf-8', # Ensure output encoding
-                bufsize=1 # Line-buffered output
+                env=self.env,
+                bufsize=0 # Unbuffered, output is read in chunks below
             )
-
-            stdout_lines = []
-            stderr_lines = []
-
-            while True:
-                # Read stdout and stderr simultaneously
-                stdout_line = process.stdout.readline()
-                stderr_line = process.stderr.readline()
-
-                if stdout_line:
-                    stdout_lines.append(stdout_line)
-                    if self.is_download:
-                        # Try to parse progress from rsync output
-                        # rsync --info=progress2 will output like '25% 1.23MB/s'
-                        match = re.search(r'(\d+)%', stdout_line)
-                        if match:
-                            try:
-                                progress_percent = int(match.group(1))
-                                self.progress_update.emit(progress_percent)
-                            except ValueError:
-                                pass # Ignore if it cannot be converted to int
-
-                if stderr_line:
-                    stderr_lines.append(stderr_line)
-
-                # Stop the loop if there's no more output and the process has ended
-                if not stdout_line and not stderr_line and process.poll() is not None:
+        finally:
+            if stdin_file:
+                stdin_file.close() # The child has its own copy
+
+        progress_buffer = bytearray() # Incomplete progress line carried between stdout chunks
+
+        # Wait on both pipes at once so a quiet stream never blocks the other
+        selector = selectors.DefaultSelector()
+        selector.register(process.stdout, selectors.EVENT_READ, self._out_buf)
+        selector.register(process.stderr, selectors.EVENT_READ, self._err_buf)
+        open_pipes = 2
+
+        # Where available (Linux), also wait on a pidfd that becomes readable when the process exits,
+        # so the loop sleeps without a timeout while the command is quiet
+        pidfd = None
+        if hasattr(os, "pidfd_open"):
+            try:
+                pidfd = os.pidfd_open(process.pid)
+                selector.register(pidfd, selectors.EVENT_READ, None)
+            except OSError:
+                pidfd = None
+        wait_timeout = None if pidfd is not None else 0.1
+
+        while open_pipes:
+            events = selector.select(timeout=wait_timeout)
+            if not events:
+                # Stop if the process has ended but something still holds the pipes open
+                if process.poll() is not None:
                     break
+                continue
+
+            for key, _ in events:
+                if key.data is None:
+                    # Process exited, drain what is left in the pipes with the short timeout
+                    selector.unregister(pidfd)
+                    wait_timeout = 0.1
+                    continue
+                chunk = os.read(key.fd, 4096)
+                if not chunk:
+                    selector.unregister(key.fileobj) # End of stream, stop watching this pipe
+                    open_pipes -= 1
+                    continue
+                if not (self.is_download and key.fileobj is process.stdout):
+                    key.data.write(chunk)
+                    if self.watch_ipa and key.fileobj is process.stdout:
+                        self._scan_ipa_name(chunk)
+                    elif self.stream_bundles and key.fileobj is process.stdout:
+                        self._scan_bundle_entries(chunk)
+                    continue
+
+                # rsync --info=progress2 rewrites its progress line with '\r', so cut at the last '\r' or '\n'
+                # and keep the unfinished tail for the next chunk
+                progress_buffer += chunk
+                end = max(progress_buffer.rfind(b'\r'), progress_buffer.rfind(b'\n'))
+                if end < 0:
+                    continue
+                complete = progress_buffer[:end]
+                del progress_buffer[:end + 1]
+                for line in complete.replace(b'\r', b'\n').split(b'\n'):
+                    if not line:
+                        continue # Empty piece between '\r' and '\n'
+                    # Cheap '%' reject for file name lines before running the regex
+                    match = _PROGRESS_RE.search(line) if b'%' in line else None
+                    if not match:
+                        self._out_buf.write(line + b'\n') # Only non-progress lines end up in the log
+                        continue
+                    pct = int(match.group(1))
+                    now = time.monotonic()
+                    # Only send changed values, at most ~30 times per second, to keep the UI thread idle
+                    if pct != self._last_pct and (now - self._last_emit) > 0.033:
+                        self.progress_update.emit(pct)
+                        self._last_pct = pct
+                        self._last_emit = now
+
+        self._out_buf.write(progress_buffer) # Output after the last line break
+        selector.close()
+        if pidfd is not None:
+            os.close(pidfd)
+
+        # Wait for the process to finish and get the final returncode
+        return process.wait()
+
+    def _scan_ipa_name(self, chunk):
+        # Search complete lines for the IPA filename as they arrive, and report the first one found
+        self._ipa_line_buffer += chunk
+        end = self._ipa_line_buffer.rfind(b'\n')
+        if end < 0:
+            return
+        match = _IPA_RE.search(self._ipa_line_buffer, 0, end)
+        if match:
+            self.ipa_detected.emit(match.group(1).decode('utf-8', errors='replace').strip())
+            self.watch_ipa = False # Only the first one counts
+            self._ipa_line_buffer.clear()
+        else:
+            del self._ipa_line_buffer[:end + 1]
+
+    def _scan_bundle_entries(self, chunk):
+        # The listing is the mtime line followed by NUL separated paths, report the complete paths of each chunk
+        self._bundle_buffer += chunk
+        if not self._bundle_mtime_seen:
+            newline = self._bundle_buffer.find(b'\n')
+            if newline < 0:
+                return
+            del self._bundle_buffer[:newline + 1]
+            self._bundle_mtime_seen = True
+        end = self._bundle_buffer.rfind(b'\0')
+        if end < 0:
+            return
+        entries = [entry.decode('utf-8', errors='replace') for entry in self._bundle_buffer[:end].split(b'\0') if entry.strip()]
+        del self._bundle_buffer[:end + 1]
+        if entries:
+            self.bundle_entries.emit(entries)
 
-            # Wait for the process to finish and get the final returncode
-            process.wait()
-            end_time = time.time()
-            time_taken = end_time - start_time
+# Signals for ToolCheckRunnable
+class ToolCheckSignals(QObject):
+    finished = pyqtSignal(dict) # Tool name -> absolute path, or None if it is not on PATH
 
-            self.finished.emit("".join(stdout_lines), "".join(stderr_lines), process.returncode, time_taken)
+# QRunnable that looks up the external tools off the UI thread at startup
+class ToolCheckRunnable(QRunnable):
+    def __init__(self):
+        super().__init__()
+        self.setAutoDelete(False) # The app keeps a reference, Python owns it
+        self.signals = ToolCheckSignals()
 
-        except FileNotFoundError:
-            self.error.emit("Error: SSH, SCP, or rsync command not found. Make sure it's installed and in your PATH.")
-        except Exception as e:
-            self.error.emit(f"An error occurred while running the command: {e}")
+    def run(self):
+        # PATH lookup only, no need to spawn sshpass/rsync just to see if they exist. The paths are
+        # reused in every command so starting one doesn't search PATH again
+        self.signals.finished.emit({tool: shutil.which(tool) for tool in _TOOLS})
 
 # Class for a blinking connection indicator
 class ConnectionIndicator(QWidget):
@@ -90,41 +304,57 @@ class ConnectionIndicator(QWidget):
         self.setFixedSize(QSize(10, 10)) # Dot size
         self._color = QColor("red") # Default: red (not connected)
         self.animation_timer = QTimer(self)
+        self.animation_timer.setTimerType(Qt.TimerType.CoarseTimer) # Blink timing is not critical, let the OS batch the wakeups
         self.animation_timer.timeout.connect(self._animate_dot)
-        self.current_alpha = 255 # For blinking effect
+        self.blink_interval = 0 # Blink interval in ms, 0 when not blinking
         self.is_on = True # On/off status for blinking
+        self._window_hidden = False # Set while the window is minimized (spontaneous hide event)
 
         self.set_status("disconnected") # Set initial status
 
     def set_status(self, status, time_taken=None):
         if status == "connected_fast":
             self._color = QColor("#c0ffee")
-            self.animation_timer.start(250) # Fast blink
-            self.is_on = True
+            self.blink_interval = 250 # Fast blink
         elif status == "connected_slow":
             self._color = QColor("#fab52a")
-            self.animation_timer.start(500) # Slower blink
-            self.is_on = True
+            self.blink_interval = 500 # Slower blink
         elif status == "disconnected":
             self._color = QColor("#d6184f")
-            self.animation_timer.stop() # Stop blinking
-            self.is_on = True # Ensure it's fully visible (not blinking)
+            self.blink_interval = 0 # No blinking
+        self.is_on = True # Ensure it's fully visible
+        self._sync_blink_timer()
         self.update()
 
+    def _sync_blink_timer(self):
+        # Only run the blink timer while there is something to blink and the dot is on screen
+        if self.blink_interval and self.isVisible() and not self._window_hidden:
+            self.animation_timer.start(self.blink_interval)
+        else:
+            self.animation_timer.stop()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._window_hidden = False
+        self._sync_blink_timer()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        # Minimizing sends a spontaneous hide that leaves isVisible() True, so remember it separately
+        self._window_hidden = event.spontaneous()
+        self._sync_blink_timer()
+
     def _animate_dot(self):
         # Change blinking to on/off
         self.is_on = not self.is_on
-        self.current_alpha = 255 if self.is_on else 0 # Directly set alpha to 0 or 255
         self.update()
 
     def paintEvent(self, event):
+        if not self.is_on:
+            return # Blink "off" phase, nothing to draw
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        color_with_alpha = QColor(self._color)
-        color_with_alpha.setAlpha(self.current_alpha) # Use the set alpha
-
-        painter.setBrush(QBrush(color_with_alpha))
+        painter.setBrush(QBrush(self._color))
         painter.setPen(QPen(Qt.PenStyle.NoPen))
         painter.drawEllipse(0, 0, self.width(), self.height())
 
@@ -139,16 +369,49 @@ class IPAExtractorApp(QWidget):
         self.ipa_available = False # Status of IPA availability for download
         self.last_generated_ipa_filename = None # To store the filename of the last generated IPA
         self.all_bundle_paths = [] # List to store all fetched bundle paths
+        self._all_bundles_lc = [] # Case-folded copy of all_bundle_paths, used for filtering
+        self._pending_filter_text = "" # Latest filter text, applied when the debounce timer fires
+        self._last_query = "" # Case-folded text of the previous filter run
+        self._last_filtered_indices = [] # Indices into all_bundle_paths matched by _last_query
         self.debug_mode = False # Default: debug mode off (cleaner log)
-
-        self.init_ui()
-        self._check_sshpass_availability()
-        self._check_rsync_availability() # Check rsync availability
-        self.connection_indicator.set_status("disconnected") # Set initial indicator status
-        self._update_input_field_states() # Update input field states initially
-
+        self._last_btn_state = None # (enabled mask, mechanism) last applied by _apply_mode
+        self._last_input_state = None # State last applied by _update_input_field_states
+        self._ssh_ctl = None # ControlPath socket of the shared SSH connection, set when connecting
+        self._ssh_target = None # user@host of the current connection
+        self._ssh_argv = [] # Command prefixes built by _prepare_ssh_argv when connecting
+        self._scp_argv = []
+        self._rsync_argv = []
+        self._log_queue = [] # (text, color) pairs waiting for the next log flush
+        self._bundle_cache = None # Cached bundle list ({"mtime", "paths"}) the running fetch compares against
+        self.bundle_list_worker = None # Workers of the last command of each kind, see disconnect_ssh
+        self.execute_worker = None
+        self.download_worker = None
+        self.key_worker = None
+        self._bundle_streaming = False # True once the running fetch has replaced the list with streamed entries
+        self.sshpass_available = False # Set by the startup tool check
+        self._use_key = False # Set once the SSH key is installed, commands then leave out sshpass
+        self.rsync_available = False # Set by the startup tool check
+        self._tool_paths = {} # Absolute tool paths from the startup tool check, see _tool
+        self._creds = Credentials() # Filled from the inputs by _refresh_creds
+
+        self.init_ui() # Also sets the initial button/input states
+
+        # Check tools and show the rsync pop-up only after the window is up, so nothing blocks the first paint
+        QTimer.singleShot(0, self._deferred_startup)
+
+    def _deferred_startup(self):
+        # Look up sshpass/rsync on the thread pool, _on_tools_checked reports the result
+        self.tool_check = ToolCheckRunnable()
+        self.tool_check.signals.finished.connect(self._on_tools_checked)
+        QThreadPool.globalInstance().start(self.tool_check)
+
+    def _on_tools_checked(self, tool_paths):
+        self._tool_paths = tool_paths
+        self._set_sshpass_availability(tool_paths["sshpass"] is not None)
+        self._set_rsync_availability(tool_paths["rsync"] is not None)
+        self._update_button_states() # The download button depends on rsync
         # Show rsync warning pop-up on iPhone
-        self.show_rsync_warning_popup()
+        QTimer.singleShot(150, self.show_rsync_warning_popup)
 
     def show_rsync_warning_popup(self):
         msg = QMessageBox()
@@ -215,6 +478,12 @@ class IPAExtractorApp(QWidget):
         ssh_config_group_layout.addLayout(connect_disconnect_layout, row, 0, 1, 2) # Span 2 columns
         row += 1
 
+        # Copies a key to the iPhone once, later connections skip the password
+        self.install_key_btn = QPushButton("Install SSH Key")
+        self.install_key_btn.clicked.connect(self.install_ssh_key)
+        ssh_config_group_layout.addWidget(self.install_key_btn, row, 0, 1, 2) # Span 2 columns
+        row += 1
+
         # Debug Mode Checkbox
         self.debug_checkbox = QCheckBox("Verbose")
         self.debug_checkbox.setChecked(self.debug_mode) # Set initial status
@@ -222,6 +491,12 @@ class IPAExtractorApp(QWidget):
         ssh_config_group_layout.addWidget(self.debug_checkbox, row, 0, 1, 2, alignment=Qt.AlignmentFlag.AlignLeft)
         row += 1
 
+        # Compression Checkbox (only worth it on slow remote links, on Wi-Fi it just costs iPhone CPU)
+        self.compress_checkbox = QCheckBox("Compress download (WAN)")
+        self.compress_checkbox.setChecked(False)
+        ssh_config_group_layout.addWidget(self.compress_checkbox, row, 0, 1, 2, alignment=Qt.AlignmentFlag.AlignLeft)
+        row += 1
+
 
         # Script and Bundle Path Section
         path_group_layout = QGridLayout()
@@ -262,6 +537,12 @@ class IPAExtractorApp(QWidget):
         self.remote_script_path_input.setPlaceholderText("/var/mobile/Documents/extract-ipa.sh") # Default placeholder for transfer target
         path_group_layout.addWidget(self.remote_script_path_input, current_row, 0, 1, 3) # Input spans all 3 columns
 
+        # Read the inputs once per edit instead of on every button click
+        for line_edit in (self.ip_input, self.username_input, self.password_input,
+                          self.remote_script_path_input, self.local_script_path_input):
+            line_edit.textChanged.connect(self._refresh_creds)
+        self._refresh_creds()
+
         # Application Bundle Path (on iPhone) - label, filter input, dropdown, and refresh button
         current_row += 1
         path_group_layout.addWidget(QLabel("Application Bundle Path (on iPhone):"), current_row, 0, 1, 3) # Label spans all 3 columns
@@ -270,7 +551,12 @@ class IPAExtractorApp(QWidget):
         # New filter input for bundle paths
         self.bundle_filter_input = QLineEdit()
         self.bundle_filter_input.setPlaceholderText("Filter bundles...")
-        self.bundle_filter_input.textChanged.connect(self._filter_bundle_paths)
+        self.bundle_filter_input.textChanged.connect(self._schedule_bundle_filter)
+        # Debounce timer so a burst of keystrokes only refilters the dropdown once
+        self._bundle_filter_timer = QTimer(self)
+        self._bundle_filter_timer.setSingleShot(True)
+        self._bundle_filter_timer.setInterval(120) # Roughly the gap between keystrokes when typing a word
+        self._bundle_filter_timer.timeout.connect(self._do_filter)
         path_group_layout.addWidget(self.bundle_filter_input, current_row, 0, 1, 3) # Filter input spans all 3 columns
         current_row += 1
 
@@ -278,10 +564,13 @@ class IPAExtractorApp(QWidget):
         self.bundle_path_combo = QComboBox() # Replaced QLineEdit with QComboBox
         self.bundle_path_combo.setEditable(False) # No longer editable for typing, only for selecting
         self.bundle_path_combo.setPlaceholderText("/var/containers/Bundle/Application/YOUR-UUID/YourApp.app")
+        # Items live in a string list model so the list can be replaced in one model reset instead of item by item
+        self._bundle_model = QStringListModel(self)
+        self.bundle_path_combo.setModel(self._bundle_model)
         bundle_path_controls_layout.addWidget(self.bundle_path_combo)
 
         self.refresh_bundle_btn = QPushButton("Refresh")
-        self.refresh_bundle_btn.clicked.connect(self.fetch_bundle_paths)
+        self.refresh_bundle_btn.clicked.connect(lambda: self.fetch_bundle_paths(force=True)) # Refresh always re-lists
         bundle_path_controls_layout.addWidget(self.refresh_bundle_btn)
 
         path_group_layout.addLayout(bundle_path_controls_layout, current_row, 0, 1, 3) # Dropdown and button in column 0, span 3
@@ -315,9 +604,17 @@ class IPAExtractorApp(QWidget):
         main_grid_layout.addLayout(right_panel_layout, 1, 1, 1, 1) # Row 1, Col 1, span 1x1
 
         right_panel_layout.addWidget(QLabel("<h2></h2>"))
-        self.log_output = QTextEdit()
+        # Plain text view: line based layout, appending does not re-layout the whole log
+        self.log_output = QPlainTextEdit()
         self.log_output.setReadOnly(True)
         self.log_output.setFont(QFont("Monospace", 10))
+        self.log_output.setMaximumBlockCount(5000) # Drop the oldest messages in long sessions
+        self._log_vsb = self.log_output.verticalScrollBar() # Looked up once, used on every log flush
+        # Log lines are queued by display_log and written in one batch, the timer only runs while lines are waiting
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(16) # About one frame
+        self._log_flush_timer.timeout.connect(self._flush_log)
         right_panel_layout.addWidget(self.log_output)
 
         # QProgressBar for download progress
@@ -332,35 +629,43 @@ class IPAExtractorApp(QWidget):
         main_grid_layout.setColumnStretch(0, 25) # Left panel (25%)
         main_grid_layout.setColumnStretch(1, 75) # Right panel (75%)
 
-        # Initial UI update based on default selection
+        # Initial UI update based on default selection (also updates button and input field states)
         self._update_script_mechanism_ui(self.script_mechanism_combo.currentIndex())
-        self._check_sshpass_availability()
-        self._update_button_states() # Update button states initially
-        self._update_input_field_states() # Update input field states initially
 
-    def _update_button_states(self):
+    def _update_button_states(self, extra_mask=0):
         # Set button status based on SSH connection status
-        is_ssh_ready = self.ssh_connected
-        self.connect_btn.setEnabled(not is_ssh_ready) # Connect active if not connected
-        self.disconnect_btn.setEnabled(is_ssh_ready) # Disconnect active if connected
-
-        current_mechanism_index = self.script_mechanism_combo.currentIndex()
-
-        if current_mechanism_index == 0: # Local Script
-            self.transfer_script_btn.setEnabled(is_ssh_ready)
-            self.run_script_btn.setEnabled(False) # Run button disabled for Local Script
-            self.download_ipa_btn.setEnabled(is_ssh_ready and self.ipa_available and self.last_generated_ipa_filename is not None and self.rsync_available) # Only active if IPA is available, filename known, and rsync available
-        else: # iPhone Script
-            self.transfer_script_btn.setEnabled(False) # Transfer button disabled for iPhone Script
-            self.run_script_btn.setEnabled(is_ssh_ready)
-            self.download_ipa_btn.setEnabled(is_ssh_ready and self.ipa_available and self.last_generated_ipa_filename is not None and self.rsync_available) # Only active if IPA is available, filename known, and rsync available
-
-        self.refresh_bundle_btn.setEnabled(is_ssh_ready)
+        if not self.ssh_connected:
+            mode = UiMode.IDLE
+        elif self.ipa_available and self.last_generated_ipa_filename is not None:
+            mode = UiMode.IPA_READY
+        else:
+            mode = UiMode.CONNECTED
+        self._apply_mode(mode, extra_mask)
         self._update_input_field_states() # Call to update input field states
 
+    def _apply_mode(self, mode, extra_mask=0):
+        # Enable exactly the buttons of the mode's mask, skipped if the result equals what was applied last
+        mask = _MODE_ENABLED[mode] | extra_mask
+        if not self.rsync_available:
+            mask &= ~_BTN_DOWNLOAD # Download needs rsync
+        mechanism = self.script_mechanism_combo.currentIndex()
+        if (mask, mechanism) == self._last_btn_state:
+            return
+        self._last_btn_state = (mask, mechanism)
+        # Local Script (index 0) uses Transfer & Run, iPhone Script uses Run, the other one stays disabled
+        script_btn, other_btn = (self.transfer_script_btn, self.run_script_btn) if mechanism == 0 else (self.run_script_btn, self.transfer_script_btn)
+        for button, bit in ((self.connect_btn, _BTN_CONNECT), (self.disconnect_btn, _BTN_DISCONNECT),
+                            (self.refresh_bundle_btn, _BTN_REFRESH), (script_btn, _BTN_SCRIPT),
+                            (other_btn, 0), (self.download_ipa_btn, _BTN_DOWNLOAD),
+                            (self.install_key_btn, _BTN_KEY)):
+            button.setEnabled(bool(mask & bit))
+
     def _update_input_field_states(self):
         # Set read-only status for IP, username, and password inputs
         is_connected = self.ssh_connected
+        if is_connected == self._last_input_state:
+            return # Already applied
+        self._last_input_state = is_connected
         self.ip_input.setReadOnly(is_connected)
         self.username_input.setReadOnly(is_connected)
         self.password_input.setReadOnly(is_connected)
@@ -371,7 +676,13 @@ class IPAExtractorApp(QWidget):
 
 
     def disconnect_ssh(self):
+        # Running commands die with the shared connection, make sure they don't reconnect on their own
+        for worker in (self.bundle_list_worker, self.execute_worker, self.download_worker, self.key_worker):
+            if worker is not None:
+                worker.cancel()
+        self._close_ssh_master()
         self.ssh_connected = False
+        self._use_key = False # The next connection may be to another iPhone
         self.ipa_available = False # Reset IPA status on disconnect
         self.last_generated_ipa_filename = None # Reset IPA filename
         self.connection_indicator.set_status("disconnected")
@@ -381,24 +692,36 @@ class IPAExtractorApp(QWidget):
         self._update_button_states() # Update button states
         self._update_input_field_states() # Update input field states
 
-    def _check_sshpass_availability(self):
-        try:
-            subprocess.run("sshpass -V", shell=True, capture_output=True, check=True)
-            self.sshpass_available = True
+    def _close_ssh_master(self):
+        # Tear down the shared SSH connection instead of waiting for ControlPersist to expire.
+        # Runs on the pool so Disconnect doesn't wait for it, the result is not needed (nothing to close, or ssh is missing)
+        if not self._ssh_ctl:
+            return
+        self.close_worker = SshRunnable(
+            [self._tool("ssh"), "-O", "exit", "-o", f"ControlPath={self._ssh_ctl}", self._ssh_target], debug=self.debug_mode
+        )
+        self.close_worker.log_message.connect(self._handle_worker_log_message) # Connect log signal to new handler
+        QThreadPool.globalInstance().start(self.close_worker)
+
+    def _tool(self, name):
+        # Path found by the startup check, or the bare name (resolved by exec) if the check hasn't finished
+        return self._tool_paths.get(name) or name
+
+    def _set_sshpass_availability(self, available):
+        # Result of the PATH lookup done by ToolCheckRunnable
+        self.sshpass_available = available
+        if self.sshpass_available:
             self.display_log("sshpass found. Password authentication via GUI will be supported.", "#c0ffee")
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            self.sshpass_available = False
+        else:
             self.display_log("Warning: sshpass not found. Password authentication might require separate CLI interaction.", "orange")
             self.display_log("To install sshpass (Ubuntu/Debian): sudo apt-get install sshpass", "orange")
             self.display_log("To install sshpass (macOS with Homebrew): brew install https://raw.githubusercontent.com/kadwanev/brew-sshpass/master/sshpass.rb", "orange")
 
-    def _check_rsync_availability(self):
-        try:
-            subprocess.run("rsync --version", shell=True, capture_output=True, check=True)
-            self.rsync_available = True
+    def _set_rsync_availability(self, available):
+        self.rsync_available = available
+        if self.rsync_available:
             self.display_log("rsync found. Download progress will be displayed.", "#c0ffee")
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            self.rsync_available = False
+        else:
             self.display_log("Warning: rsync not found. IPA download will proceed without progress display (using scp fallback).", "orange")
             self.display_log("To install rsync (Ubuntu/Debian): sudo apt-get install rsync", "orange")
             self.display_log("To install rsync (macOS with Homebrew): brew install rsync", "orange")
@@ -447,18 +770,32 @@ class IPAExtractorApp(QWidget):
 
 
     def display_log(self, text, color="black"):
-        # Display text in the log area with a specific color
-        cursor = self.log_output.textCursor()
+        # Queue text for the log area with a specific color, _flush_log writes it out
+        self._log_queue.append((text, color))
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start() # Messages that follow within the interval join the same batch
+
+    def _flush_log(self):
+        # Append all queued log messages and scroll once per flush
+        if not self._log_queue:
+            return
+        queued, self._log_queue = self._log_queue, []
+        document = self.log_output.document()
+        cursor = QTextCursor(document)
         cursor.movePosition(QTextCursor.MoveOperation.End)
-        format = QTextCharFormat()
-        format.setForeground(QColor(color))
-        cursor.insertText(text + "\n", format)
-        self.log_output.setTextCursor(cursor)
-        self.log_output.verticalScrollBar().setValue(self.log_output.verticalScrollBar().maximum()) # Scroll to bottom
+        self.log_output.setUpdatesEnabled(False) # Repaint once after the batch and the scroll
+        cursor.beginEditBlock() # One undo/layout step for the whole batch
+        for text, color in queued:
+            if not document.isEmpty():
+                cursor.insertBlock() # Each message starts on a new line
+            cursor.insertText(text, _log_format(color)) # Plain text with a cached format, no HTML parsing
+        cursor.endEditBlock()
+        self._log_vsb.setValue(self._log_vsb.maximum()) # Scroll to bottom
+        self.log_output.setUpdatesEnabled(True)
 
     def _handle_worker_log_message(self, message, color):
         """
-        Slot to receive log messages from WorkerThread.
+        Slot to receive log messages from SshRunnable.
         Displays messages only if debug_mode is active or if the message is not an execution command.
         """
         if self.debug_mode or not message.startswith("Executing command:"):
@@ -468,65 +805,127 @@ class IPAExtractorApp(QWidget):
         """Enable/disable debug mode."""
         self.debug_mode = checked
         if self.debug_mode:
-            self.display_log("Debug mode enabled (showing all commands).", "dark#c0ffee")
+            self.display_log("Debug mode enabled (showing all commands).", "#c0ffee")
         else:
-            self.display_log("Debug mode disabled (log will be cleaner).", "dark#c0ffee")
-
-    def _build_ssh_command(self, action, password, ip, username, remote_path=None, local_path=None, bundle_path=None, remote_ls_path=None, remote_ipa_full_path=None, local_save_path=None):
-        base_command = ""
+            self.display_log("Debug mode disabled (log will be cleaner).", "#c0ffee")
+
+    def _prepare_ssh_argv(self, password, ip, username):
+        # Build the invariant command prefixes once per connection, actions only append their own arguments
+        auth = [self._tool("sshpass"), "-e"] if self.sshpass_available and password and not self._use_key else [] # sshpass -e reads SSHPASS (see _build_ssh_env)
+        # ssh tries the installed key first and only falls back to the password if the iPhone rejects it
+        key_options = ["-i", _KEY_FILE] if os.path.exists(_KEY_FILE) else []
+        # Share one SSH connection between all commands (OpenSSH ControlMaster), only the first one pays for the handshake
+        mux_options = [
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={self._ssh_ctl}",
+            "-o", "ControlPersist=600s", # Keep the master around between actions
+            "-o", "ServerAliveInterval=30", # Keep-alive so NAT/Wi-Fi idle timeouts don't silently kill the master
+            "-o", "ServerAliveCountMax=3", # and a dead link is noticed after ~90s instead of hanging
+        ]
+        self._ssh_target = f"{username}@{ip}"
+        ssh = self._tool("ssh")
+        self._ssh_argv = [*auth, ssh, "-p", "22", *key_options, *mux_options, self._ssh_target] # ssh takes the port as -p
+        self._scp_argv = [*auth, self._tool("scp"), "-P", "22", *key_options, *mux_options] # scp takes the port as -P
+        self._rsync_argv = [*auth, self._tool("rsync"), "-e", shlex.join([ssh, "-p", "22", *key_options, *mux_options])]
+
+    def _build_ssh_command(self, action, remote_path=None, bundle_path=None, remote_ls_path=None, remote_ipa_full_path=None, local_save_path=None, cached_mtime=None):
+        # Commands are argv lists run without a shell, built on the prefixes from _prepare_ssh_argv
         if action == "test_connection":
             # Simple command to test SSH connection
-            base_command = f"ssh -P 22 {username}@{ip} 'echo Connected'"
-        elif action == "transfer":
-            base_command = f"scp -P 22 {local_path} {username}@{ip}:{os.path.dirname(remote_path)}"
-        elif action == "execute":
+            return self._ssh_argv + ["echo Connected"]
+        elif action in ("execute", "transfer_and_execute"):
             # This command will:
             # 1. Change to the script directory on iPhone (cd {remote_script_directory})
-            # 2. Grant execute permission to the script (chmod +x extract-ipa.sh)
-            # 3. Run the script with bundle path as argument (./extract-ipa.sh "bundle_path")
-            # All this is done in one SSH command
-            script_dir = os.path.dirname(remote_path)
-            script_name = os.path.basename(remote_path)
-            base_command = (
-                f"ssh -P 22 {username}@{ip} "
-                f"'cd \"{script_dir}\" && chmod +x \"./{script_name}\" && \"./{script_name}\" \"{bundle_path}\"'"
-            )
+            # 2. For transfer_and_execute only: save the script coming in on stdin (cat > extract-ipa.sh)
+            # 3. Grant execute permission to the script (chmod +x extract-ipa.sh)
+            # 4. Run the script with bundle path as argument (./extract-ipa.sh 'bundle_path')
+            # All this is done in one SSH command. The remote shell parses it, so every path is shell-quoted
+            script_dir = shlex.quote(os.path.dirname(remote_path))
+            script = shlex.quote("./" + os.path.basename(remote_path))
+            upload = f"cat > {script} && " if action == "transfer_and_execute" else ""
+            return self._ssh_argv + [
+                f"cd {script_dir} && {upload}chmod +x {script} && {script} {shlex.quote(bundle_path)}"
+            ]
+        elif action == "install_key":
+            # Append the public key coming in on stdin to authorized_keys, unless it is already there
+            return self._ssh_argv + [
+                "umask 077; mkdir -p ~/.ssh && k=$(cat) && "
+                "{ grep -qxF \"$k\" ~/.ssh/authorized_keys 2>/dev/null || echo \"$k\" >> ~/.ssh/authorized_keys; }"
+            ]
+        elif action == "verify_key":
+            # Fresh login with only the key (no shared connection, no password prompt), to see if the iPhone accepts it.
+            # Built without the shared prefix because ssh keeps the first value of an option and that one sets ControlPath
+            return [
+                self._tool("ssh"), "-p", "22", "-i", _KEY_FILE,
+                "-o", "ControlPath=none", "-o", "BatchMode=yes", "-o", "IdentitiesOnly=yes",
+                "-o", "PreferredAuthentications=publickey", "-o", "ConnectTimeout=10",
+                self._ssh_target, "true"
+            ]
         elif action == "list_bundles":
-            base_command = (
-                f"ssh -P 22 {username}@{ip} "
-                f"'ls {remote_ls_path}'"
-            )
+            # One remote call prints the folder's mtime on the first line, then lists every .app inside the
+            # bundle folders, NUL separated so names with spaces survive. The listing is skipped when the
+            # mtime still equals the cached one (apps are installed/removed as folders in this directory)
+            ls_dir = shlex.quote(remote_ls_path.rstrip('/'))
+            return self._ssh_argv + [
+                f"m=$(stat -c %Y {ls_dir} 2>/dev/null || stat -f %m {ls_dir}); echo \"$m\"; "
+                f"[ \"$m\" = {shlex.quote(cached_mtime or 'none')} ] || find {ls_dir} -maxdepth 2 -name '*.app' -print0"
+            ]
         elif action == "download_ipa":
             if self.rsync_available:
-                # Use rsync for progress
-                base_command = f"rsync -avz --info=progress2 -e 'ssh -p 22' {username}@{ip}:\"{remote_ipa_full_path}\" \"{local_save_path}\""
+                # Use rsync for progress. No compression by default (the iPhone CPU is the bottleneck on a LAN).
+                # An interrupted download is kept in a partial dir next to the target and used as the delta basis
+                # next time, so it resumes without trusting it blindly. The target itself is only replaced once
+                # the whole file arrived, an existing IPA of the same name is overwritten (not appended to).
+                # -s hands the remote path to the remote rsync as-is instead of through the remote shell,
+                # so IPA names with spaces or quotes need no escaping
+                rsync_options = ["-av", "-s", "--info=progress2", "--partial-dir=.extractipa-partial"]
+                if self.compress_checkbox.isChecked():
+                    rsync_options.append("-z")
+                return self._rsync_argv + rsync_options + [f"{self._ssh_target}:{remote_ipa_full_path}", local_save_path]
             else:
                 # Fallback to scp if rsync is not available (without progress)
-                base_command = f"scp -P 22 {username}@{ip}:\"{remote_ipa_full_path}\" \"{local_save_path}\""
-
+                return self._scp_argv + [f"{self._ssh_target}:{remote_ipa_full_path}", local_save_path]
+        return []
+
+    def _refresh_creds(self):
+        # Snapshot of the inputs used by the action handlers, updated whenever one of them changes
+        self._creds.local_script = self.local_script_path_input.text()
+        self._creds.ip = self.ip_input.text().strip()
+        self._creds.username = self.username_input.text().strip()
+        self._creds.password = self.password_input.text()
+        self._creds.remote_script = self.remote_script_path_input.text().strip()
+
+    def _build_ssh_env(self, password):
+        # Environment for commands from _build_ssh_command, keeps the password out of argv and `ps`
         if self.sshpass_available and password:
-            return f"sshpass -p '{password}' {base_command}"
-        else:
-            return base_command
+            return {**os.environ, "SSHPASS": password}
+        return None
 
     def test_ssh_connection(self):
-        ip = self.ip_input.text().strip()
-        username = self.username_input.text().strip()
-        password = self.password_input.text()
+        ip = self._creds.ip
+        username = self._creds.username
+        password = self._creds.password
 
         if not ip or not username:
             QMessageBox.warning(self, "Input Error", "Please fill in iPhone IP and Username first.")
             return
 
-        test_command = self._build_ssh_command("test_connection", password, ip, username)
+        # Control socket for the shared SSH connection used by every following command.
+        # One per remote user/host/port (ssh expands the % tokens), so a master that is still alive
+        # from an earlier session is picked up again without a new handshake. Note that such a master
+        # also means the typed password is not checked again, the existing login is reused
+        try:
+            os.makedirs(_CTL_DIR, mode=0o700, exist_ok=True)
+            os.chmod(_CTL_DIR, 0o700) # Also tighten a directory that already existed
+        except OSError as e:
+            self.display_log(f"Could not create {_CTL_DIR}: {e}", "red")
+            return
+        self._ssh_ctl = os.path.join(_CTL_DIR, "%r@%h:%p")
+        self._prepare_ssh_argv(password, ip, username)
+        test_command = self._build_ssh_command("test_connection")
 
         self.display_log(f"Attempting SSH connection test to {ip}...", "#00face")
-        self.connect_btn.setEnabled(False)
-        self.disconnect_btn.setEnabled(False) # Disable disconnect button also when trying to connect
-        self.transfer_script_btn.setEnabled(False)
-        self.run_script_btn.setEnabled(False) # Also disable this when testing connection
-        self.refresh_bundle_btn.setEnabled(False)
-        self.download_ipa_btn.setEnabled(False) # Disable download button
+        self._apply_mode(UiMode.BUSY) # Also disable connect/disconnect when trying to connect
         self.ipa_available = False # Reset IPA status
         self.last_generated_ipa_filename = None # Reset IPA filename
         self.connection_indicator.set_status("disconnected") # Set to red when trying to connect
@@ -534,11 +933,11 @@ class IPAExtractorApp(QWidget):
         self.download_progress_bar.setValue(0) # Reset progress bar
         self._update_input_field_states() # Ensure input fields are non-editable when trying to connect
 
-        self.test_worker = WorkerThread(test_command, measure_time=True)
+        self.test_worker = SshRunnable(test_command, measure_time=True, env=self._build_ssh_env(password), debug=self.debug_mode)
         self.test_worker.finished.connect(self.on_test_connection_finished)
         self.test_worker.error.connect(self.on_worker_error)
         self.test_worker.log_message.connect(self._handle_worker_log_message) # Connect log signal to new handler
-        self.test_worker.start()
+        QThreadPool.globalInstance().start(self.test_worker)
 
     def on_test_connection_finished(self, stdout, stderr, returncode, time_taken):
         self.display_log("Transmission Status", "#f7f5de")
@@ -563,7 +962,7 @@ class IPAExtractorApp(QWidget):
                 self.display_log("Access denied. Check username and password.", "red")
             elif "Connection refused" in stderr or "Host unreachable" in stderr:
                 self.display_log("Connection refused or host unreachable. Check IP and network.", "red")
-            elif not self.sshpass_available and self.password_input.text():
+            elif not self.sshpass_available and self._creds.password:
                 self.display_log("Warning: sshpass not installed, password might be requested in external CLI.", "orange")
             self.ssh_connected = False
             self.ipa_available = False
@@ -572,6 +971,11 @@ class IPAExtractorApp(QWidget):
 
         self._update_button_states() # Update button states based on new SSH connection status
 
+        if self.ssh_connected:
+            # Fill the bundle dropdown right away over the fresh shared connection, so the list is
+            # being fetched while the user is still looking at the UI instead of after pressing Refresh
+            self.fetch_bundle_paths()
+
 
     def transfer_and_run_script(self):
         # Function to transfer script via SCP and then run it via SSH
@@ -582,15 +986,15 @@ class IPAExtractorApp(QWidget):
             QMessageBox.warning(self, "Input Error", "This button is only for 'Local Script' mechanism.")
             return
 
-        local_script = self.local_script_path_input.text()
-        ip = self.ip_input.text().strip()
-        username = self.username_input.text().strip()
-        password = self.password_input.text()
-        remote_script = self.remote_script_path_input.text().strip()
-        bundle_path = self.bundle_path_combo.currentText().strip() # Get from dropdown
+        local_script = self._creds.local_script
+        ip = self._creds.ip
+        username = self._creds.username
+        password = self._creds.password
+        remote_script = self._creds.remote_script
+        bundle_path = self._selected_bundle_path() # Get from dropdown
 
         # Input validation
-        if not local_script or not os.path.exists(local_script):
+        if not local_script or not os.path.isfile(local_script): # Checked on click, the file may have changed since it was chosen
             QMessageBox.warning(self, "Input Error", "Please select a valid extract-ipa.sh script on your laptop.")
             return
         if not ip or not username or not remote_script or not bundle_path:
@@ -598,130 +1002,221 @@ class IPAExtractorApp(QWidget):
             return
 
         # Disable buttons during operation
-        self.transfer_script_btn.setEnabled(False)
-        self.run_script_btn.setEnabled(False) # Ensure run button is also disabled
-        self.connect_btn.setEnabled(False)
-        self.disconnect_btn.setEnabled(False)
-        self.refresh_bundle_btn.setEnabled(False)
-        self.download_ipa_btn.setEnabled(False) # Disable download button
+        self._apply_mode(UiMode.BUSY)
         self.ipa_available = False # Reset IPA status before new operation
         self.last_generated_ipa_filename = None # Reset IPA filename
         self.download_progress_bar.setVisible(False) # Hide progress bar
         self.download_progress_bar.setValue(0) # Reset progress bar
 
-        # Step 1: Transfer Script (SCP)
-        scp_command = self._build_ssh_command(
-            "transfer", password, ip, username,
-            remote_path=remote_script, local_path=local_script
+        # Upload and run the script in one SSH command: the local script is fed to stdin and written
+        # to the target path on iPhone, then run, so it needs a single channel instead of scp + ssh
+        ssh_command = self._build_ssh_command(
+            "transfer_and_execute", remote_path=remote_script, bundle_path=bundle_path
         )
 
-        self.display_log(f"Attempting to transfer script: {scp_command}", "#00face")
+        self.display_log(f"Attempting to transfer and run script on iPhone: {shlex.join(ssh_command)}", "#00face")
 
-        self.transfer_worker = WorkerThread(scp_command)
-        # After transfer is finished, call on_transfer_finished_and_then_run
-        self.transfer_worker.finished.connect(
-            lambda stdout, stderr, returncode, time_taken:
-                self.on_transfer_finished_and_then_run(
-                    stdout, stderr, returncode, time_taken,
-                    ip, username, password, remote_script, bundle_path
-                )
-        )
-        self.transfer_worker.error.connect(self.on_worker_error)
-        self.transfer_worker.log_message.connect(self._handle_worker_log_message) # Connect log signal to new handler
-        self.transfer_worker.start()
+        self.execute_worker = SshRunnable(ssh_command, env=self._build_ssh_env(password), debug=self.debug_mode, stdin_path=local_script, watch_ipa=True, reconnect=True)
+        self.execute_worker.finished.connect(self.on_execute_finished)
+        self.execute_worker.ipa_detected.connect(self._on_ipa_detected)
+        self.execute_worker.error.connect(self.on_worker_error)
+        self.execute_worker.log_message.connect(self._handle_worker_log_message) # Connect log signal to new handler
+        QThreadPool.globalInstance().start(self.execute_worker)
 
-    def on_transfer_finished_and_then_run(self, stdout, stderr, returncode, time_taken, ip, username, password, remote_script, bundle_path):
-        self.display_log("Script Result", "#f7f5de")
-        if stdout:
-            self.display_log(stdout, "black")
-        if stderr:
-            self.display_log(stderr, "red")
 
-        if returncode == 0:
-            self.display_log("Script transferred successfully!", "#c0ffee")
+    def _bundle_cache_path(self, ip, username):
+        # Bundle list cache file for this device and user
+        return os.path.join(os.path.expanduser("~/.cache/extractipa"), f"bundles-{ip}-{username}.json")
 
-            # Step 2: Run Script (SSH) after successful transfer
-            ssh_command = self._build_ssh_command(
-                "execute", password, ip, username,
-                remote_path=remote_script, bundle_path=bundle_path
-            )
+    def _load_bundle_cache(self, ip, username):
+        try:
+            with open(self._bundle_cache_path(ip, username), encoding="utf-8") as cache_file:
+                cache = json.load(cache_file)
+            return cache if isinstance(cache.get("mtime"), str) and isinstance(cache.get("paths"), list) else None
+        except (OSError, ValueError, AttributeError):
+            return None # No cache yet, or unreadable
+
+    def _save_bundle_cache(self, ip, username, mtime, paths):
+        cache_path = self._bundle_cache_path(ip, username)
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, "w", encoding="utf-8") as cache_file:
+                json.dump({"mtime": mtime, "paths": paths}, cache_file)
+        except OSError as e:
+            self.display_log(f"Warning: could not save bundle list cache: {e}", "orange")
+
+    def _replace_bundle_items(self, paths):
+        # Swap the dropdown contents in one model reset, with signals and repaints held back meanwhile
+        self.bundle_path_combo.blockSignals(True)
+        self.bundle_path_combo.setUpdatesEnabled(False)
+        self._bundle_model.setStringList(paths)
+        self.bundle_path_combo.setUpdatesEnabled(True)
+        self.bundle_path_combo.blockSignals(False)
 
-            self.display_log(f"Attempting to run script on iPhone: {ssh_command}", "#00face")
+    def _set_bundle_paths(self, paths):
+        # Entries look like /var/containers/Bundle/Application/UUID/YourApp.app, sort them by app name
+        self.all_bundle_paths = sorted(paths, key=lambda path: os.path.basename(path).lower())
+        self._all_bundles_lc = [path.casefold() for path in self.all_bundle_paths]
+        self._last_query = "" # Earlier filter results refer to the old list
+        self._filter_bundle_paths(self.bundle_filter_input.text()) # Keep a filter typed meanwhile applied
 
-            self.execute_worker = WorkerThread(ssh_command)
-            self.execute_worker.finished.connect(self.on_execute_finished)
-            self.execute_worker.error.connect(self.on_worker_error)
-            self.execute_worker.log_message.connect(self._handle_worker_log_message) # Connect log signal to new handler
-            self.execute_worker.start() # Start worker for execution
-        else:
-            self.display_log(f"Script transfer failed with code {returncode}.", "red")
-            self.display_log("Please ensure IP, username, password are correct, and OpenSSH is installed on iPhone.", "red")
-            if "Permission denied" in stderr:
-                self.display_log("Access denied. Check username and password.", "red")
-            elif "No such file or directory" in stderr:
-                self.display_log("Destination directory on iPhone not found. Check script path on iPhone.", "red")
-            elif not self.sshpass_available and self.password_input.text():
-                self.display_log("Warning: sshpass not installed, password might be requested in external CLI.", "orange")
+    def install_ssh_key(self):
+        # Create the app's key pair if needed and add its public key to the iPhone over the current connection
+        if not self.ssh_connected:
+            QMessageBox.warning(self, "Connection Error", "Please connect to SSH first using the 'Connect SSH' button.")
+            return
 
-            # Re-enable buttons if transfer failed
-            self._update_button_states()
+        self._apply_mode(UiMode.BUSY)
+        if os.path.exists(_KEY_FILE):
+            self._start_key_install()
+            return
 
+        # Create the key pair first, on the pool like every other command, then install it
+        try:
+            os.makedirs(os.path.dirname(_KEY_FILE), exist_ok=True)
+        except OSError as e:
+            self.display_log(f"Could not create SSH key {_KEY_FILE}: {e}", "red")
+            self._update_button_states()
+            return
+        self.keygen_worker = SshRunnable(
+            [self._tool("ssh-keygen"), "-q", "-t", "ed25519", "-N", "", "-C", "extractipa", "-f", _KEY_FILE], debug=self.debug_mode
+        )
+        self.keygen_worker.finished.connect(self.on_key_generated)
+        self.keygen_worker.error.connect(lambda message: self.on_key_generated("", message, -1, 0.0)) # A local failure, the connection is fine
+        self.keygen_worker.log_message.connect(self._handle_worker_log_message) # Connect log signal to new handler
+        QThreadPool.globalInstance().start(self.keygen_worker)
+
+    def on_key_generated(self, stdout, stderr, returncode, time_taken):
+        if returncode != 0:
+            self.display_log(f"Could not create SSH key {_KEY_FILE} (code {returncode}).", "red")
+            if stderr:
+                self.display_log(stderr, "red")
+            self._update_button_states() # Re-enable buttons after completion
+            return
+        self.display_log(f"Created SSH key {_KEY_FILE}", "#c0ffee")
+        self._start_key_install()
+
+    def _start_key_install(self):
+        # Append the public key on the iPhone, on_key_installed switches to key logins
+        key_command = self._build_ssh_command("install_key")
+        self.display_log("Installing SSH key on iPhone...", "#00face")
+
+        self.key_worker = SshRunnable(key_command, env=self._build_ssh_env(self._creds.password), debug=self.debug_mode, stdin_path=_KEY_FILE + ".pub", reconnect=True)
+        self.key_worker.finished.connect(self.on_key_installed)
+        self.key_worker.error.connect(self.on_worker_error)
+        self.key_worker.log_message.connect(self._handle_worker_log_message) # Connect log signal to new handler
+        QThreadPool.globalInstance().start(self.key_worker)
+
+    def on_key_installed(self, stdout, stderr, returncode, time_taken):
+        if returncode != 0:
+            self.display_log(f"Failed to install SSH key with code {returncode}.", "red")
+            if stderr:
+                self.display_log(stderr, "red")
+            self._update_button_states() # Re-enable buttons after completion
+            return
+        # The key is in authorized_keys, but sshd may still refuse it (StrictModes with loose home
+        # permissions, pubkey auth disabled), so log in with it once before dropping the password
+        self.display_log("SSH key added, checking that the iPhone accepts it...", "#00face")
+        self.key_worker = SshRunnable(self._build_ssh_command("verify_key"), debug=self.debug_mode)
+        self.key_worker.finished.connect(self.on_key_verified)
+        self.key_worker.error.connect(self.on_worker_error)
+        self.key_worker.log_message.connect(self._handle_worker_log_message) # Connect log signal to new handler
+        QThreadPool.globalInstance().start(self.key_worker)
+
+    def on_key_verified(self, stdout, stderr, returncode, time_taken):
+        if returncode == 0:
+            # Following commands authenticate with the key (or reuse the open connection), no sshpass needed
+            self._use_key = True
+            self._prepare_ssh_argv(self._creds.password, self._creds.ip, self._creds.username)
+            self.display_log("SSH key installed. Connections to this iPhone no longer need the password.", "#c0ffee")
+        else:
+            self.display_log("The iPhone did not accept the SSH key, password login stays in use.", "orange")
+            self.display_log("Check that PubkeyAuthentication is enabled and that the home and ~/.ssh folders are not writable by others.", "orange")
+            if stderr:
+                self.display_log(stderr, "red")
+        self._update_button_states() # Re-enable buttons after completion
 
-    def fetch_bundle_paths(self):
-        # Function to get a list of bundle folders from iPhone
+    def fetch_bundle_paths(self, force=False):
+        # Function to get a list of bundle folders from iPhone.
+        # Unless forced (Refresh button), a cached list is shown at once and only re-listed if the device changed
         if not self.ssh_connected:
             QMessageBox.warning(self, "Connection Error", "Please connect to SSH first using the 'Connect SSH' button.")
             return
 
-        ip = self.ip_input.text().strip()
-        username = self.username_input.text().strip()
-        password = self.password_input.text()
+        ip = self._creds.ip
+        username = self._creds.username
+        password = self._creds.password
 
         if not ip or not username:
             QMessageBox.warning(self, "Input Error", "Please fill in iPhone IP and Username first.")
             return
 
+        self._bundle_cache = None if force else self._load_bundle_cache(ip, username)
+        if self._bundle_cache:
+            self._set_bundle_paths(self._bundle_cache["paths"]) # Usable right away, checked against the device below
+
         # Path for `ls`
         ls_path = "/var/containers/Bundle/Application/"
         ls_command = self._build_ssh_command(
-            "list_bundles", password, ip, username,
-            remote_ls_path=ls_path
+            "list_bundles", remote_ls_path=ls_path,
+            cached_mtime=self._bundle_cache["mtime"] if self._bundle_cache else None
         )
 
         self.display_log(f"Attempting to retrieve bundle list from: {ls_path}", "#00face")
 
-        self.bundle_list_worker = WorkerThread(ls_command)
+        self._bundle_streaming = False
+        self.bundle_list_worker = SshRunnable(ls_command, env=self._build_ssh_env(password), debug=self.debug_mode, reconnect=True, stream_bundles=True)
+        self.bundle_list_worker.bundle_entries.connect(self._on_bundle_entries)
         self.bundle_list_worker.finished.connect(self.on_bundle_paths_fetched)
         self.bundle_list_worker.error.connect(self.on_worker_error)
         self.bundle_list_worker.log_message.connect(self._handle_worker_log_message) # Connect log signal to new handler
-        self.refresh_bundle_btn.setEnabled(False) # Disable button while process is running
-        self.transfer_script_btn.setEnabled(False) # Also disable transfer button
-        self.run_script_btn.setEnabled(False) # Also disable run button
-        self.download_ipa_btn.setEnabled(False) # Disable download button
+        self._apply_mode(UiMode.FETCHING) # Disable action buttons while process is running
         self.ipa_available = False # Reset IPA status
         self.last_generated_ipa_filename = None # Reset IPA filename
         self.download_progress_bar.setVisible(False) # Hide progress bar
         self.download_progress_bar.setValue(0) # Reset progress bar
-        self.bundle_list_worker.start()
+        QThreadPool.globalInstance().start(self.bundle_list_worker)
+
+    def _is_stale_bundle_result(self):
+        # Results of a listing that was replaced by a newer one, or that ended after Disconnect
+        return not self.ssh_connected or self.bundle_list_worker is None or self.sender() is not self.bundle_list_worker.signals
+
+    def _on_bundle_entries(self, entries):
+        if self._is_stale_bundle_result():
+            return
+        # Show bundle paths while the listing is still running, on_bundle_paths_fetched sorts the full list at the end
+        if not self._bundle_streaming:
+            # The first streamed entries replace the cached list shown while the fetch started
+            self._bundle_streaming = True
+            self.all_bundle_paths = []
+            self._all_bundles_lc = []
+        self.all_bundle_paths.extend(entries)
+        self._all_bundles_lc.extend(path.casefold() for path in entries)
+        self._last_query = "" # Earlier filter results don't include the new entries
+        self._filter_bundle_paths(self.bundle_filter_input.text()) # Shows everything if no filter is typed
 
     def on_bundle_paths_fetched(self, stdout, stderr, returncode, time_taken): # Added time_taken
+        if self._is_stale_bundle_result():
+            return
         self.display_log("Bundle List Output", "#869ef8")
-        if stdout:
-            self.display_log(stdout, "#f7f5de")
+        # First line is the folder's mtime, then find -print0 output which separates entries with NUL
+        mtime, _, listing = stdout.partition("\n")
+        mtime = mtime.strip()
+        bundle_entries = [entry for entry in listing.split("\0") if entry.strip()]
+        unchanged = self._bundle_cache is not None and mtime == self._bundle_cache["mtime"]
+        if bundle_entries:
+            self.display_log("\n".join(bundle_entries), "#f7f5de")
         if stderr:
             self.display_log(stderr, "red")
 
         if returncode == 0:
-            self.display_log("Bundle list retrieved successfully!", "#c0ffee")
-            self.all_bundle_paths = [] # Clear master list
-            self.bundle_path_combo.clear() # Clear dropdown
-
-            base_path = "/var/containers/Bundle/Application/"
-            for line in stdout.splitlines():
-                if line.strip(): # Ensure line is not empty
-                    full_path = f"{base_path}{line.strip()}/"
-                    self.all_bundle_paths.append(full_path) # Add to master list
-                    self.bundle_path_combo.addItem(full_path) # Add to dropdown
+            if unchanged:
+                self.display_log("Bundle list unchanged on iPhone, using the cached list.", "#c0ffee")
+            else:
+                self.display_log("Bundle list retrieved successfully!", "#c0ffee")
+                self._set_bundle_paths(bundle_entries)
+                if mtime:
+                    self._save_bundle_cache(self._creds.ip, self._creds.username, mtime, self.all_bundle_paths)
 
             self.bundle_path_combo.setEditable(False) # No longer editable, only for selection
         else:
@@ -731,36 +1226,50 @@ class IPAExtractorApp(QWidget):
                 self.display_log("Access denied. Check username and password.", "red")
             elif "No such file or directory" in stderr:
                 self.display_log("Directory '/var/containers/Bundle/Application/' not found on iPhone.", "red")
-            elif not self.sshpass_available and self.password_input.text():
+            elif not self.sshpass_available and self._creds.password:
                 self.display_log("Warning: sshpass not installed, password might be requested in external CLI.", "orange")
 
         self._update_button_states() # Re-enable buttons after completion
         self.bundle_path_combo.hidePopup() # Hide popup after refresh, let filter input control it
 
-    def _filter_bundle_paths(self, text):
-        # Temporarily block signals to prevent recursion when clearing/adding items
-        self.bundle_path_combo.blockSignals(True)
+    def _selected_bundle_path(self):
+        # The dropdown shows .../UUID/YourApp.app, the extraction script expects the bundle folder .../UUID/
+        path = self.bundle_path_combo.currentText().strip()
+        if path.endswith(".app"):
+            path = os.path.dirname(path) + "/"
+        return path
+
+    def _schedule_bundle_filter(self, text):
+        # Remember the text and restart the debounce timer, _do_filter runs once typing pauses
+        self._pending_filter_text = text
+        self._bundle_filter_timer.start()
 
-        self.bundle_path_combo.clear()
+    def _do_filter(self):
+        self._filter_bundle_paths(self._pending_filter_text)
+
+    def _filter_bundle_paths(self, text):
         if text:
-            # Filter bundle paths based on input text (case-insensitive)
-            filtered_paths = [
-                path for path in self.all_bundle_paths
-                if text.lower() in path.lower()
-            ]
-            self.bundle_path_combo.addItems(filtered_paths)
+            # Filter bundle paths based on input text (case-insensitive, against the precomputed case-folded list)
+            needle = text.casefold()
+            if self._last_query and self._last_query in needle:
+                # The new query contains the previous one, so only the previous matches can still match
+                candidates = self._last_filtered_indices
+            else:
+                candidates = range(len(self.all_bundle_paths))
+            self._last_filtered_indices = [i for i in candidates if needle in self._all_bundles_lc[i]]
+            self._last_query = needle
+            filtered_paths = [self.all_bundle_paths[i] for i in self._last_filtered_indices]
+            self._replace_bundle_items(filtered_paths)
             if filtered_paths:
                 self.bundle_path_combo.showPopup() # Show popup if there are results
             else:
                 self.bundle_path_combo.hidePopup() # Hide if no results
         else:
             # If text is empty, show all items again
-            self.bundle_path_combo.addItems(self.all_bundle_paths)
+            self._last_query = ""
+            self._replace_bundle_items(self.all_bundle_paths)
             self.bundle_path_combo.hidePopup() # Hide popup if text is empty
 
-        # Re-enable signals
-        self.bundle_path_combo.blockSignals(False)
-
 
     def run_script_on_iphone(self):
         # Function to run script on iPhone via SSH (for iPhone Script)
@@ -772,13 +1281,13 @@ class IPAExtractorApp(QWidget):
             QMessageBox.warning(self, "Input Error", "This button is only for 'iPhone Script' mechanism.")
             return
 
-        ip = self.ip_input.text().strip()
-        username = self.username_input.text().strip()
-        password = self.password_input.text()
-        remote_script = self.remote_script_path_input.text().strip()
+        ip = self._creds.ip
+        username = self._creds.username
+        password = self._creds.password
+        remote_script = self._creds.remote_script
 
         # Get text from QComboBox
-        bundle_path = self.bundle_path_combo.currentText().strip()
+        bundle_path = self._selected_bundle_path()
 
         # Input validation
         if not ip or not username or not remote_script or not bundle_path:
@@ -786,29 +1295,28 @@ class IPAExtractorApp(QWidget):
             return
 
         ssh_command = self._build_ssh_command(
-            "execute", password, ip, username,
-            remote_path=remote_script, bundle_path=bundle_path
+            "execute", remote_path=remote_script, bundle_path=bundle_path
         )
 
-        self.display_log(f"Attempting to run script on iPhone: {ssh_command}", "#00face")
+        self.display_log(f"Attempting to run script on iPhone: {shlex.join(ssh_command)}", "#00face")
 
         # Disable buttons during operation
-        self.transfer_script_btn.setEnabled(False)
-        self.run_script_btn.setEnabled(False)
-        self.connect_btn.setEnabled(False)
-        self.disconnect_btn.setEnabled(False)
-        self.refresh_bundle_btn.setEnabled(False)
-        self.download_ipa_btn.setEnabled(False) # Disable download button
+        self._apply_mode(UiMode.BUSY)
         self.ipa_available = False # Reset IPA status before new operation
         self.last_generated_ipa_filename = None # Reset IPA filename
         self.download_progress_bar.setVisible(False) # Hide progress bar
         self.download_progress_bar.setValue(0) # Reset progress bar
 
-        self.execute_worker = WorkerThread(ssh_command)
+        self.execute_worker = SshRunnable(ssh_command, env=self._build_ssh_env(password), debug=self.debug_mode, watch_ipa=True, reconnect=True)
         self.execute_worker.finished.connect(self.on_execute_finished)
+        self.execute_worker.ipa_detected.connect(self._on_ipa_detected)
         self.execute_worker.error.connect(self.on_worker_error)
         self.execute_worker.log_message.connect(self._handle_worker_log_message) # Connect log signal to new handler
-        self.execute_worker.start()
+        QThreadPool.globalInstance().start(self.execute_worker)
+
+    def _on_ipa_detected(self, ipa_filename):
+        # Remember the filename as soon as the script prints it, on_execute_finished decides if it is usable
+        self.last_generated_ipa_filename = ipa_filename
 
     def on_execute_finished(self, stdout, stderr, returncode, time_taken): # Added time_taken
         self.display_log("--- Script Execution Output ---", "#f7f5de")
@@ -822,10 +1330,8 @@ class IPAExtractorApp(QWidget):
             self.display_log("The .ipa file should have been created in the same directory as the script on iPhone.", "#c0ffee")
             self.ipa_available = True # Set IPA status to True on success
 
-            # Extract actual IPA filename from stdout
-            match = re.search(r"IPA: (.+\.ipa)", stdout)
-            if match:
-                self.last_generated_ipa_filename = match.group(1).strip()
+            # The IPA filename was picked up from stdout while the script ran (see _on_ipa_detected)
+            if self.last_generated_ipa_filename:
                 self.display_log(f"Detected IPA filename: {self.last_generated_ipa_filename}", "#c0ffee")
             else:
                 self.display_log("Warning: Could not automatically detect IPA filename from script output.", "orange")
@@ -838,9 +1344,11 @@ class IPAExtractorApp(QWidget):
                 self.display_log("Access denied. Check username/password or script file permissions on iPhone.", "red")
             elif "command not found" in stderr:
                 self.display_log("SSH or scp command not found on your laptop, or script not found on iPhone.", "red")
+            elif "No such file or directory" in stderr or "can't cd" in stderr:
+                self.display_log("Script directory on iPhone not found. Check script path on iPhone.", "red")
             elif "Error: application bundle directory DOES NOT exists." in stdout or "Error: application .app directory DOES NOT exists." in stdout:
                 self.display_log("Application bundle path on iPhone is incorrect or does not exist.", "red")
-            elif not self.sshpass_available and self.password_input.text():
+            elif not self.sshpass_available and self._creds.password:
                 self.display_log("Warning: sshpass not installed, password might be requested in external CLI.", "orange")
             self.ipa_available = False # Set IPA status to False on failure
             self.last_generated_ipa_filename = None # Reset IPA filename
@@ -859,10 +1367,8 @@ class IPAExtractorApp(QWidget):
             QMessageBox.warning(self, "rsync Not Found", "rsync is not installed on your system. Download will proceed without progress display (using scp). Please install rsync for progress functionality.")
 
 
-        ip = self.ip_input.text().strip()
-        username = self.username_input.text().strip()
-        password = self.password_input.text()
-        remote_script_path = self.remote_script_path_input.text().strip()
+        password = self._creds.password
+        remote_script_path = self._creds.remote_script
 
         # Use the last detected IPA filename
         ipa_filename = self.last_generated_ipa_filename
@@ -882,31 +1388,25 @@ class IPAExtractorApp(QWidget):
         # SCP or rsync command to pull file from iPhone to laptop
         # Format: scp username@ip:remote_path local_path
         download_command = self._build_ssh_command(
-            "download_ipa", password, ip, username,
-            remote_ipa_full_path=remote_ipa_full_path, local_save_path=local_save_path
+            "download_ipa", remote_ipa_full_path=remote_ipa_full_path, local_save_path=local_save_path
         )
 
-        self.display_log(f"Attempting to download IPA: {download_command}", "#00face")
+        self.display_log(f"Attempting to download IPA: {shlex.join(download_command)}", "#00face")
 
         # Disable buttons during download operation
-        self.transfer_script_btn.setEnabled(False)
-        self.run_script_btn.setEnabled(False)
-        self.connect_btn.setEnabled(False)
-        self.disconnect_btn.setEnabled(False)
-        self.refresh_bundle_btn.setEnabled(False)
-        self.download_ipa_btn.setEnabled(False)
+        self._apply_mode(UiMode.BUSY)
 
         # Show progress bar
         self.download_progress_bar.setValue(0)
         self.download_progress_bar.setVisible(True)
 
 
-        self.download_worker = WorkerThread(download_command, is_download=True) # Set is_download to True
+        self.download_worker = SshRunnable(download_command, is_download=True, env=self._build_ssh_env(password), debug=self.debug_mode, reconnect=True) # Set is_download to True
         self.download_worker.finished.connect(self.on_ipa_download_finished)
         self.download_worker.error.connect(self.on_worker_error)
         self.download_worker.progress_update.connect(self.download_progress_bar.setValue) # Connect progress signal
         self.download_worker.log_message.connect(self._handle_worker_log_message) # Connect log signal to new handler
-        self.download_worker.start()
+        QThreadPool.globalInstance().start(self.download_worker)
 
     def on_ipa_download_finished(self, stdout, stderr, returncode, time_taken):
         self.display_log("--- IPA Download Output ---", "#f7f5de")
@@ -934,8 +1434,7 @@ class IPAExtractorApp(QWidget):
     def on_worker_error(self, message):
         self.display_log(message, "darkred")
         QMessageBox.critical(self, "Error", message)
-        self._update_button_states() # Ensure buttons are re-enabled if an error occurs
-        self.connect_btn.setEnabled(True) # Also enable connect button
+        self._update_button_states(extra_mask=_BTN_CONNECT) # Ensure buttons are re-enabled if an error occurs, connect included
         self.connection_indicator.set_status("disconnected") # Set status to red if general error
         self.download_progress_bar.setVisible(False) # Hide progress bar
         self.download_progress_bar.setValue(0) # Reset progress bar